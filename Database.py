@@ -1,22 +1,76 @@
 import sqlite3
+import threading
+from contextlib import contextmanager
 from datetime import datetime
-from typing import List, Iterable, Dict
+from typing import List, Iterable, Dict, NamedTuple
 
 from VideoFile import VideoFile
 
 
+class FileStats(NamedTuple):
+    min_rating: int
+    max_rating: int
+    min_size: int
+    max_size: int
+    min_date: datetime
+    max_date: datetime
+    min_path: str
+    max_path: str
+
+
 class Database:
+    _pragmas = '''
+        PRAGMA journal_mode=WAL;
+        PRAGMA synchronous=NORMAL;
+        PRAGMA cache_size=-65536;
+        PRAGMA temp_store=MEMORY;
+        PRAGMA mmap_size=268435456;
+        PRAGMA foreign_keys=ON;
+    '''
+
     def __init__(self, db_path):
         self.db_path = db_path
 
         self.settings = {}
         self.settings_loaded = False
 
-        self.conn = sqlite3.connect(db_path)
-        self.cursor = self.conn.cursor()
+        self._local = threading.local()
+        self._connections: List[sqlite3.Connection] = []
+        self._connections_lock = threading.Lock()
+        self.write_lock = threading.Lock()
 
         self.create_tables()
 
+        self.cursor.execute('SELECT id, name FROM tags')
+        self._tag_ids: Dict[str, int] = {name: tag_id for tag_id, name in self.cursor.fetchall()}
+
+        try:
+            self._max_vars = self.conn.getlimit(sqlite3.SQLITE_LIMIT_VARIABLE_NUMBER)
+        except AttributeError:
+            self._max_vars = 900
+
+    @property
+    def conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, isolation_level=None, check_same_thread=False,
+                                   cached_statements=256)
+            conn.row_factory = sqlite3.Row
+            if self.db_path != ':memory:':
+                conn.executescript(self._pragmas)
+            self._local.conn = conn
+            with self._connections_lock:
+                self._connections.append(conn)
+        return conn
+
+    @property
+    def cursor(self) -> sqlite3.Cursor:
+        cursor = getattr(self._local, 'cursor', None)
+        if cursor is None:
+            cursor = self.conn.cursor()
+            self._local.cursor = cursor
+        return cursor
+
     def create_tables(self):
         self.cursor.execute('''
             CREATE TABLE IF NOT EXISTS files (
@@ -30,51 +84,178 @@ class Database:
         self.cursor.execute('''
             CREATE TABLE IF NOT EXISTS tags (
                 id INTEGER PRIMARY KEY AUTOINCREMENT,
-                name TEXT NOT NULL
+                name TEXT NOT NULL,
+                use_count INTEGER NOT NULL DEFAULT 0
             )''')
+        self.cursor.execute('PRAGMA table_info(tags)')
+        if 'use_count' not in {row[1] for row in self.cursor.fetchall()}:
+            self.cursor.execute('ALTER TABLE tags ADD COLUMN use_count INTEGER NOT NULL DEFAULT 0')
+            self.cursor.execute('UPDATE tags SET use_count = '
+                                '(SELECT COUNT(*) FROM file_has_tag WHERE tag_id = tags.id)')
         self.cursor.execute('''
             CREATE TABLE IF NOT EXISTS file_has_tag (
                 file_id INTEGER NOT NULL REFERENCES files(id),
                 tag_id INTEGER NOT NULL REFERENCES tags(id))''')
+        self.cursor.execute('SELECT 1 FROM file_has_tag GROUP BY file_id, tag_id HAVING COUNT(*) > 1 LIMIT 1')
+        if self.cursor.fetchone() is not None:
+            self.cursor.execute('''DELETE FROM file_has_tag WHERE rowid NOT IN (
+                SELECT MIN(rowid) FROM file_has_tag GROUP BY file_id, tag_id)''')
+        self.cursor.execute('''CREATE UNIQUE INDEX IF NOT EXISTS idx_file_tag ON file_has_tag(file_id, tag_id)''')
         self.cursor.execute('''CREATE INDEX IF NOT EXISTS idx_file_id ON file_has_tag(file_id)''')
         self.cursor.execute('''CREATE INDEX IF NOT EXISTS idx_tag_id ON file_has_tag(tag_id)''')
+        self.cursor.execute('SELECT 1 FROM tags GROUP BY name HAVING COUNT(*) > 1 LIMIT 1')
+        if self.cursor.fetchone() is not None:
+            # Older databases allowed duplicate tag names; fold each name onto
+            # its lowest id so the unique index below can be created.
+            self.cursor.execute('''
+                INSERT OR IGNORE INTO file_has_tag (file_id, tag_id)
+                SELECT fht.file_id, (SELECT MIN(t2.id) FROM tags t2 WHERE t2.name = t.name)
+                  FROM file_has_tag fht JOIN tags t ON t.id = fht.tag_id
+                 WHERE t.id > (SELECT MIN(t2.id) FROM tags t2 WHERE t2.name = t.name)''')
+            self.cursor.execute('''
+                DELETE FROM file_has_tag WHERE tag_id IN (
+                    SELECT id FROM tags t WHERE id > (SELECT MIN(id) FROM tags t2 WHERE t2.name = t.name))''')
+            self.cursor.execute('''
+                DELETE FROM tags WHERE id IN (
+                    SELECT id FROM tags t WHERE id > (SELECT MIN(id) FROM tags t2 WHERE t2.name = t.name))''')
+            self.cursor.execute('UPDATE tags SET use_count = '
+                                '(SELECT COUNT(*) FROM file_has_tag WHERE tag_id = tags.id)')
+        self.cursor.execute('''CREATE UNIQUE INDEX IF NOT EXISTS idx_tags_name ON tags(name)''')
+        self.cursor.execute('''CREATE INDEX IF NOT EXISTS idx_files_size ON files(size)''')
+        self.cursor.execute('''CREATE INDEX IF NOT EXISTS idx_files_date ON files(date_modified)''')
+        self.cursor.execute('''CREATE INDEX IF NOT EXISTS idx_files_rating ON files(rating)''')
+        self.cursor.execute('''
+            CREATE TRIGGER IF NOT EXISTS fht_ai AFTER INSERT ON file_has_tag BEGIN
+                UPDATE tags SET use_count = use_count + 1 WHERE id = NEW.tag_id;
+            END''')
+        self.cursor.execute('''
+            CREATE TRIGGER IF NOT EXISTS fht_ad AFTER DELETE ON file_has_tag BEGIN
+                UPDATE tags SET use_count = use_count - 1 WHERE id = OLD.tag_id;
+            END''')
         self.conn.commit()
 
         self.cursor.execute('''
             CREATE TABLE IF NOT EXISTS settings (
             key TEXT PRIMARY KEY,
             value TEXT)''')
+        self.cursor.execute('''ANALYZE''')
+
+    @contextmanager
+    def transaction(self):
+        with self.write_lock:
+            self.cursor.execute('BEGIN IMMEDIATE')
+            try:
+                yield self.cursor
+                self.cursor.execute('COMMIT')
+            except Exception:
+                self.cursor.execute('ROLLBACK')
+                raise
+
+    def backup(self, target_path: str):
+        target = sqlite3.connect(target_path)
+        try:
+            with target:
+                self.conn.backup(target)
+        finally:
+            target.close()
 
     def close(self):
-        self.conn.close()
+        with self._connections_lock:
+            for conn in self._connections:
+                conn.close()
+            self._connections.clear()
+        self._local = threading.local()
 
     def get_file(self, file_id: int) -> VideoFile:
         self.cursor.execute('SELECT path, size, date_modified, duration, rating FROM files WHERE id = ?', (file_id,))
-        path, size, date_modified, duration, rating = self.cursor.fetchone()
+        row = self.cursor.fetchone()
         self.cursor.execute('SELECT name FROM tags INNER JOIN file_has_tag ON tags.id = file_has_tag.tag_id WHERE '
                             'file_has_tag.file_id = ?', (file_id,))
         tags = {tag_row[0] for tag_row in self.cursor.fetchall()}
-        return VideoFile(file_id, path, size, datetime.fromisoformat(date_modified), duration, rating, tags)
+        return VideoFile(file_id, row['path'], row['size'], datetime.fromisoformat(row['date_modified']),
+                         row['duration'], row['rating'], tags)
 
     def find_file(self, path: str) -> VideoFile | None:
         self.cursor.execute('SELECT id FROM files WHERE path = ?', (path,))
         file_id = self.cursor.fetchone()
         return self.get_file(file_id[0]) if file_id is not None else None
 
+    _file_select = ('SELECT f.id, f.path, f.size, f.date_modified, f.duration, f.rating, '
+                    '       GROUP_CONCAT(t.name, char(31)) '
+                    '  FROM files f '
+                    '  LEFT JOIN file_has_tag fht ON fht.file_id = f.id '
+                    '  LEFT JOIN tags t ON t.id = fht.tag_id ')
+    _file_query = _file_select + ' GROUP BY f.id '
+
+    @staticmethod
+    def _file_from_row(row) -> VideoFile:
+        file_id, path, size, date_modified, duration, rating, tags = row
+        return VideoFile(file_id, path, size, datetime.fromisoformat(date_modified), duration, rating,
+                         set(tags.split('\x1f')) if tags else set())
+
     def get_files(self) -> List[VideoFile]:
-        self.cursor.execute('SELECT id FROM files ORDER BY path')
-        file_ids = [row[0] for row in self.cursor.fetchall()]
-        return [self.get_file(file_id) for file_id in file_ids]
+        self.cursor.execute(self._file_query + 'ORDER BY f.path')
+        return [self._file_from_row(row) for row in self.cursor]
+
+    def get_file_stats(self) -> FileStats | None:
+        self.cursor.execute('SELECT COUNT(*), MIN(COALESCE(rating, 0)), MAX(COALESCE(rating, 0)), '
+                            '       MIN(size), MAX(size), MIN(date_modified), MAX(date_modified), '
+                            '       MIN(path), MAX(path) '
+                            '  FROM files')
+        count, min_rating, max_rating, min_size, max_size, min_date, max_date, min_path, max_path = \
+            self.cursor.fetchone()
+        if not count:
+            return None
+        return FileStats(min_rating, max_rating, min_size, max_size,
+                         datetime.fromisoformat(min_date), datetime.fromisoformat(max_date), min_path, max_path)
 
     def get_files_with_tags(self, whitelist: Iterable[str], blacklist: Iterable[str]) -> List[VideoFile]:
-        self.cursor.execute('SELECT id FROM files '
-                            ' WHERE id IN (SELECT file_id FROM file_has_tag '
-                            '               WHERE tag_id IN (SELECT id FROM tags WHERE name IN (?))) '
-                            '                 AND id NOT IN (SELECT file_id FROM file_has_tag '
-                            '                                 WHERE tag_id IN (SELECT id FROM tags WHERE name IN (?)))',
-                            (whitelist, blacklist))
-        file_ids = [row[0] for row in self.cursor.fetchall()]
-        return [self.get_file(file_id) for file_id in file_ids]
+        whitelist = list(whitelist)
+        blacklist = list(blacklist)
+        wl_ph = ','.join('?' * len(whitelist)) or "''"
+        bl_ph = ','.join('?' * len(blacklist)) or "''"
+        self.cursor.execute(self._file_query +
+                            f'HAVING TOTAL(t.name IN ({wl_ph})) >= ? AND TOTAL(t.name IN ({bl_ph})) = 0 '
+                            'ORDER BY f.path',
+                            (*whitelist, len(whitelist), *blacklist))
+        return [self._file_from_row(row) for row in self.cursor]
+
+    def _chunks(self, items: list) -> Iterable[list]:
+        for start in range(0, len(items), self._max_vars):
+            yield items[start:start + self._max_vars]
+
+    @staticmethod
+    def _like_escape(text: str) -> str:
+        return text.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+
+    def query_files(self, file_filter) -> List[VideoFile]:
+        conditions = ['f.size BETWEEN ? AND ?',
+                      'f.date_modified BETWEEN ? AND ?',
+                      'COALESCE(f.rating, 0) BETWEEN ? AND ?']
+        params = [file_filter.size_min, file_filter.size_max,
+                  file_filter.date_min.isoformat(), file_filter.date_max.isoformat(),
+                  file_filter.rating_min, file_filter.rating_max]
+        if file_filter.path:
+            conditions.append("f.path LIKE ? ESCAPE '\\'")
+            params.append(self._like_escape(file_filter.path) + '%')
+        whitelist = list(file_filter.tags_whitelist)
+        if whitelist:
+            placeholders = ','.join('?' * len(whitelist))
+            conditions.append('f.id IN (SELECT fht2.file_id FROM file_has_tag fht2 '
+                              '          JOIN tags t2 ON t2.id = fht2.tag_id '
+                              f'         WHERE t2.name IN ({placeholders}) '
+                              '          GROUP BY fht2.file_id HAVING COUNT(DISTINCT t2.name) = ?)')
+            params += whitelist + [len(whitelist)]
+        blacklist = list(file_filter.tags_blacklist)
+        if blacklist:
+            placeholders = ','.join('?' * len(blacklist))
+            conditions.append('f.id NOT IN (SELECT fht3.file_id FROM file_has_tag fht3 '
+                              '              JOIN tags t3 ON t3.id = fht3.tag_id '
+                              f'             WHERE t3.name IN ({placeholders}))')
+            params += blacklist
+        self.cursor.execute(self._file_select + ' WHERE ' + ' AND '.join(conditions) +
+                            ' GROUP BY f.id ORDER BY f.path', params)
+        return [self._file_from_row(row) for row in self.cursor]
 
     def add_file(self, file: VideoFile) -> int:
         self.cursor.execute('SELECT id FROM files WHERE path = ?', (file.path,))
@@ -83,34 +264,68 @@ class Database:
         self.cursor.execute('INSERT INTO files (path, size, date_modified, duration, rating) VALUES (?, ?, ?, ?, ?)',
                             (file.path, file.size, file.date_modified.isoformat(), file.duration, file.rating))
         file_id = self.cursor.lastrowid
-        for tag in file.tags:
-            self.set_tag(file_id, tag)
+        if file.tags:
+            self.cursor.executemany('INSERT OR IGNORE INTO tags (name) VALUES (?)',
+                                    [(tag,) for tag in file.tags])
+            placeholders = ','.join('?' * len(file.tags))
+            self.cursor.execute(f'SELECT name, id FROM tags WHERE name IN ({placeholders})', tuple(file.tags))
+            tag_ids = dict(self.cursor.fetchall())
+            self._tag_ids.update(tag_ids)
+            self.cursor.executemany('INSERT OR IGNORE INTO file_has_tag (file_id, tag_id) VALUES (?, ?)',
+                                    [(file_id, tag_id) for tag_id in tag_ids.values()])
         self.conn.commit()
         return file_id
 
+    def add_files(self, files: Iterable[VideoFile]):
+        files = list(files)
+        if not files:
+            return
+        with self.transaction() as cursor:
+            cursor.executemany(
+                'INSERT OR IGNORE INTO files (path, size, date_modified, duration, rating) VALUES (?, ?, ?, ?, ?)',
+                [(file.path, file.size, file.date_modified.isoformat(), file.duration, file.rating)
+                 for file in files])
+            tag_names = list({tag for file in files for tag in file.tags})
+            if tag_names:
+                tag_ids = {}
+                for chunk in self._chunks(tag_names):
+                    placeholders = ','.join('?' * len(chunk))
+                    cursor.execute(f'SELECT name, id FROM tags WHERE name IN ({placeholders})', chunk)
+                    tag_ids.update(cursor.fetchall())
+                missing = [name for name in tag_names if name not in tag_ids]
+                cursor.executemany('INSERT INTO tags (name) VALUES (?)', [(name,) for name in missing])
+                for chunk in self._chunks(missing):
+                    placeholders = ','.join('?' * len(chunk))
+                    cursor.execute(f'SELECT name, id FROM tags WHERE name IN ({placeholders})', chunk)
+                    tag_ids.update(cursor.fetchall())
+                self._tag_ids.update(tag_ids)
+                cursor.executemany(
+                    'INSERT OR IGNORE INTO file_has_tag (file_id, tag_id) '
+                    'SELECT id, ? FROM files WHERE path = ?',
+                    [(tag_ids[tag], file.path) for file in files for tag in file.tags])
+
     def get_tags(self) -> Dict[str, int]:
-        self.cursor.execute('SELECT name, COUNT(file_has_tag.tag_id) '
-                            '  FROM tags LEFT JOIN file_has_tag ON tags.id = file_has_tag.tag_id GROUP BY tags.id')
+        self.cursor.execute('SELECT name, use_count FROM tags')
         return {row[0]: row[1] for row in self.cursor.fetchall()}
 
     def add_tag(self, tad_name: str):
+        if tad_name in self._tag_ids:
+            return
         self.cursor.execute('INSERT INTO tags (name) VALUES (?)', (tad_name,))
+        self._tag_ids[tad_name] = self.cursor.lastrowid
         self.conn.commit()
 
     def get_tag_id(self, tag: str) -> int | None:
-        self.cursor.execute('SELECT id FROM tags WHERE name = ?', (tag,))
-        tag_id = self.cursor.fetchone()
-        return tag_id[0] if tag_id is not None else None
+        return self._tag_ids.get(tag)
 
     def set_tag(self, file_id: int, tag: str):
-        tag_id = self.get_tag_id(tag)
+        tag_id = self._tag_ids.get(tag)
         if tag_id is None:
             self.cursor.execute('INSERT INTO tags (name) VALUES (?)', (tag,))
             tag_id = self.cursor.lastrowid
-        self.cursor.execute('SELECT 1 FROM file_has_tag WHERE file_id = ? AND tag_id = ?', (file_id, tag_id))
-        if self.cursor.fetchone() is None:
-            self.cursor.execute('INSERT INTO file_has_tag (file_id, tag_id) VALUES (?, ?)', (file_id, tag_id))
-            self.conn.commit()
+            self._tag_ids[tag] = tag_id
+        self.cursor.execute('INSERT OR IGNORE INTO file_has_tag (file_id, tag_id) VALUES (?, ?)', (file_id, tag_id))
+        self.conn.commit()
 
     def remove_tag(self, file_id: int, tag: str):
         tag_id = self.get_tag_id(tag)
@@ -120,13 +335,39 @@ class Database:
         self.conn.commit()
 
     def delete_tag(self, tag: str):
-        tag_id = self.get_tag_id(tag)
+        tag_id = self._tag_ids.pop(tag, None)
         if tag_id is None:
             return
         self.cursor.execute('DELETE FROM file_has_tag WHERE tag_id = ?', (tag_id,))
         self.cursor.execute('DELETE FROM tags WHERE id = ?', (tag_id,))
         self.conn.commit()
 
+    def delete_tags(self, tags: Iterable[str]):
+        tag_ids = [tag_id for tag_id in (self._tag_ids.pop(tag, None) for tag in tags) if tag_id is not None]
+        if not tag_ids:
+            return
+        with self.transaction() as cursor:
+            for chunk in self._chunks(tag_ids):
+                placeholders = ','.join('?' * len(chunk))
+                cursor.execute(f'DELETE FROM file_has_tag WHERE tag_id IN ({placeholders})', chunk)
+                cursor.execute(f'DELETE FROM tags WHERE id IN ({placeholders})', chunk)
+
+    def set_ratings(self, pairs: Iterable[tuple[int, int | None]]):
+        with self.transaction() as cursor:
+            cursor.executemany('UPDATE files SET rating = ? WHERE id = ?',
+                               [(rating, file_id) for file_id, rating in pairs])
+
+    def set_durations(self, pairs: Iterable[tuple[int, float]]):
+        with self.transaction() as cursor:
+            cursor.executemany('UPDATE files SET duration = ? WHERE id = ?',
+                               [(duration, file_id) for file_id, duration in pairs])
+
+    def remove_files(self, file_ids: Iterable[int]):
+        rows = [(file_id,) for file_id in file_ids]
+        with self.transaction() as cursor:
+            cursor.executemany('DELETE FROM file_has_tag WHERE file_id = ?', rows)
+            cursor.executemany('DELETE FROM files WHERE id = ?', rows)
+
     def set_rating(self, file_id: int, rating: int | None):
         self.cursor.execute('UPDATE files SET rating = ? WHERE id = ?', (rating, file_id))
         self.conn.commit()
@@ -152,7 +393,6 @@ class Database:
 
     def get_settings(self) -> Dict[str, str]:
         self._load_settings()
-        print("len(self.settings)", len(self.settings))
         return self.settings
 
     def _load_settings(self):
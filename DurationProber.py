@@ -0,0 +1,66 @@
+import subprocess
+import threading
+from typing import Iterable, List, Tuple
+
+from PySide6.QtCore import QObject, QRunnable, QThreadPool, Signal
+
+from VideoFile import VideoFile
+
+
+def probe_duration(path: str) -> float | None:
+    try:
+        result = subprocess.run(
+            ['ffprobe', '-v', 'error', '-show_entries', 'format=duration',
+             '-of', 'default=noprint_wrappers=1:nokey=1', path],
+            capture_output=True, text=True, timeout=60)
+        return float(result.stdout.strip())
+    except (OSError, subprocess.TimeoutExpired, ValueError):
+        return None
+
+
+class _ProbeTask(QRunnable):
+    def __init__(self, prober: 'DurationProber', file_id: int, path: str):
+        super().__init__()
+        self.prober = prober
+        self.file_id = file_id
+        self.path = path
+
+    def run(self):
+        self.prober._deliver(self.file_id, probe_duration(self.path))
+
+
+class DurationProber(QObject):
+    """Fills in video durations with ffprobe on the global thread pool.
+
+    Results are collected into batches so the database sees one UPDATE
+    per batch instead of one commit per file.
+    """
+
+    durations_ready = Signal(list)
+
+    batch_size = 64
+
+    def __init__(self):
+        super().__init__()
+        self._lock = threading.Lock()
+        self._pending: List[Tuple[int, float]] = []
+        self._outstanding = 0
+
+    def probe(self, files: Iterable[VideoFile]):
+        pool = QThreadPool.globalInstance()
+        for file in files:
+            with self._lock:
+                self._outstanding += 1
+            pool.start(_ProbeTask(self, file.id, file.path))
+
+    def _deliver(self, file_id: int, duration: float | None):
+        flush = None
+        with self._lock:
+            self._outstanding -= 1
+            if duration is not None:
+                self._pending.append((file_id, duration))
+            if self._pending and (len(self._pending) >= self.batch_size or self._outstanding == 0):
+                flush = self._pending
+                self._pending = []
+        if flush:
+            self.durations_ready.emit(flush)
@@ -2,6 +2,4 @@ import os
 
 
 def resolve_symlink(path):
-    if os.path.islink(path):
-        return resolve_symlink(os.path.realpath(path))
-    return path
+    return os.path.realpath(path)
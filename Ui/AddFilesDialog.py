@@ -1,6 +1,8 @@
 import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
 
-from PySide6.QtCore import QDir, QObject, Signal, QThread, QItemSelectionModel, Qt
+from PySide6.QtCore import QDir, QObject, Signal, QThread, QItemSelectionModel, Qt, QTimer
 from PySide6.QtGui import QAction
 from PySide6.QtWidgets import QDialog, QVBoxLayout, QLineEdit, QTreeView, QFileSystemModel, QHBoxLayout, QPushButton, \
     QLabel
@@ -11,28 +13,85 @@ from Tools import resolve_symlink
 
 class AddFilesDialog(QDialog):
     default_filter = QDir.Filter.Dirs | QDir.Filter.NoDotAndDotDot
+    default_ignore_dirs = '.git;.svn;node_modules;__pycache__;.cache;System Volume Information;$RECYCLE.BIN'
 
     class ScanWorker(QObject):
-        file_found = Signal(str)
+        file_found = Signal(list)
         finished = Signal()
 
-        def __init__(self, directory, file_filter):
+        batch_size = 256
+
+        def __init__(self, directory, file_filter, ignore_dirs=''):
             super().__init__()
             self.directory = directory
             self.file_filter = file_filter
+            self._extensions = frozenset(s.lstrip('.').lower() for s in file_filter.split(';') if s.strip('.'))
+            self._ignore_dirs = frozenset(s for s in ignore_dirs.split(';') if s)
             self.abort_scan = False
+            self._lock = threading.Lock()
+            self._batch = []
+            self._pool: ThreadPoolExecutor | None = None
+            self._outstanding = 0
+            self._idle = threading.Event()
 
         def scan(self):
-            for root, _, files in os.walk(self.directory):
-                for file in files:
-                    if self.abort_scan:
-                        return
-                    if file.endswith(tuple(self.file_filter.split(';'))):
-                        try:
-                            file_path = resolve_symlink(os.path.join(root, file))
-                            self.file_found.emit(file_path)
-                        except Exception as e:
-                            print(e)
+            # Directory reads spend their time waiting on the kernel, so
+            # independent subtrees are walked concurrently.
+            max_workers = min(32, (os.cpu_count() or 4) * 4)
+            with ThreadPoolExecutor(max_workers=max_workers) as pool:
+                self._pool = pool
+                self._outstanding = 1
+                pool.submit(self._scan_dir, self.directory)
+                self._idle.wait()
+            self._pool = None
+            if self._batch:
+                self.file_found.emit(self._batch)
+                self._batch = []
+
+        def _scan_dir(self, directory):
+            try:
+                if self.abort_scan:
+                    return
+                batch = []
+                try:
+                    entries = os.scandir(directory)
+                except OSError as e:
+                    print(e)
+                    return
+                with entries:
+                    for entry in entries:
+                        if entry.is_dir(follow_symlinks=False):
+                            if entry.name in self._ignore_dirs:
+                                continue
+                            with self._lock:
+                                self._outstanding += 1
+                            self._pool.submit(self._scan_dir, entry.path)
+                            continue
+                        name = entry.name
+                        dot = name.rfind('.')
+                        if dot >= 0 and name[dot + 1:].lower() in self._extensions:
+                            try:
+                                stat = entry.stat()
+                                path = resolve_symlink(entry.path) if entry.is_symlink() else entry.path
+                                batch.append((path, stat.st_size, stat.st_mtime))
+                            except Exception as e:
+                                print(e)
+                if batch:
+                    self._publish(batch)
+            finally:
+                with self._lock:
+                    self._outstanding -= 1
+                    if self._outstanding == 0:
+                        self._idle.set()
+
+        def _publish(self, batch):
+            with self._lock:
+                self._batch.extend(batch)
+                if len(self._batch) < self.batch_size:
+                    return
+                full = self._batch
+                self._batch = []
+            self.file_found.emit(full)
 
         def run(self):
             self.scan()
@@ -41,7 +100,7 @@ class AddFilesDialog(QDialog):
     def __init__(self, database: Database, parent=None):
         super().__init__(parent)
         self.database = database
-        self.found_files = set()
+        self.found_files: dict[str, tuple[int, float]] = {}
 
         self.setWindowTitle("Add Files")
         self.setGeometry(100, 100, 800, 600)
@@ -58,7 +117,12 @@ class AddFilesDialog(QDialog):
 
         filters = '.mp4;.avi;.mkv;.mov;.wmv;.flv;.webm;.mpeg;.mpg;.m4v;.3gp;.vob;.ogv;.ogg;.mxf;.rm;.divx;.xvid'
         self.file_filter = QLineEdit(self.database.get_setting('scan_file_filter', filters))
-        self.file_filter.textChanged.connect(lambda text: self.database.set_setting('scan_file_filter', text))
+        self.file_filter_save_timer = QTimer(self)
+        self.file_filter_save_timer.setSingleShot(True)
+        self.file_filter_save_timer.setInterval(300)
+        self.file_filter_save_timer.timeout.connect(
+            lambda: self.database.set_setting('scan_file_filter', self.file_filter.text()))
+        self.file_filter.textChanged.connect(lambda _: self.file_filter_save_timer.start())
         self.layout.addWidget(self.file_filter)
 
         self.file_system_view = QTreeView()
@@ -96,6 +160,9 @@ class AddFilesDialog(QDialog):
 
         self.status_label = QLabel()
         self.bottom_layout.addWidget(self.status_label)
+        self.status_timer = QTimer(self)
+        self.status_timer.setInterval(100)
+        self.status_timer.timeout.connect(self.refresh_status)
 
         self.accept_button = QPushButton("Accept")
         self.accept_button.clicked.connect(self.accept)
@@ -119,7 +186,9 @@ class AddFilesDialog(QDialog):
         self.abort_scan_button.setEnabled(True)
         self.accept_button.setEnabled(False)
         self.status_label.setText("Scanning directory...")
-        self.scan_worker = AddFilesDialog.ScanWorker(scan_root, self.file_filter.text())
+        self.status_timer.start()
+        ignore_dirs = self.database.get_setting('scan_ignore', AddFilesDialog.default_ignore_dirs)
+        self.scan_worker = AddFilesDialog.ScanWorker(scan_root, self.file_filter.text(), ignore_dirs)
         self.scan_worker.file_found.connect(self.on_file_found)
         self.scan_worker.finished.connect(self.on_finished)
         self.scan_worker_thread = QThread()
@@ -127,11 +196,14 @@ class AddFilesDialog(QDialog):
         self.scan_worker_thread.started.connect(self.scan_worker.run)
         self.scan_worker_thread.start()
 
-    def on_file_found(self, file_path):
-        self.found_files.add(file_path)
+    def on_file_found(self, file_entries):
+        self.found_files.update({path: (size, mtime) for path, size, mtime in file_entries})
+
+    def refresh_status(self):
         self.status_label.setText(f"Found {len(self.found_files)} files")
 
     def on_finished(self):
+        self.status_timer.stop()
         self.status_label.setText(f"{len(self.found_files)} files found")
         self.scan_directory_button.setEnabled(True)
         self.abort_scan_button.setEnabled(False)
@@ -142,4 +214,5 @@ class AddFilesDialog(QDialog):
             self.scan_worker.abort_scan = True
             self.scan_worker_thread.quit()
             self.scan_worker_thread.wait()
+        self.status_timer.stop()
         self.status_label.setText("Scan aborted")
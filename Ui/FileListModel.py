@@ -7,13 +7,51 @@ from PySide6.QtGui import QFont
 from VideoFile import VideoFile
 
 
+_RATING_STRS = (None,) + tuple('★' * r + '☆' * (5 - r) for r in range(1, 6))
+
+
 class FileListModel(QAbstractTableModel):
     def __init__(self, files: List[VideoFile]):
         super().__init__()
         self.files = files
+        self._rebuild_columns()
         self.horizontal_header_labels = ['Name', 'Rating', 'Tags', 'Size', 'Modified', 'Duration']
         self._current_playing: VideoFile | None = None
 
+    def _rebuild_columns(self):
+        files = self.files
+        self.name_prefixes = [file.name_prefix for file in files]
+        self.names_lower = [file.name_prefix.lower() for file in files]
+        self.sizes = [file.size for file in files]
+        self.dates = [file.date_modified for file in files]
+        self.ratings = [file.rating or 0 for file in files]
+        self.durations = [file.duration or 0 for file in files]
+        self.tag_sets = [file.tags for file in files]
+        self._row_by_id = {file.id: i for i, file in enumerate(files)}
+        self._display_cache = [(file.name_prefix,
+                                humanfriendly.format_size(file.size),
+                                file.date_modified.strftime('%Y-%m-%d %H:%M:%S'),
+                                str(file.duration))
+                               for file in files]
+
+    def compute_mask(self, file_filter) -> List[bool]:
+        mask = []
+        for i, file in enumerate(self.files):
+            accepted = (file_filter.size_min <= self.sizes[i] <= file_filter.size_max
+                        and file_filter.rating_min <= self.ratings[i] <= file_filter.rating_max
+                        and file_filter.date_min <= self.dates[i] <= file_filter.date_max)
+            if accepted and file_filter.path:
+                accepted = file.path.startswith(file_filter.path)
+            if accepted and file_filter.tags_whitelist:
+                accepted = file_filter.tags_whitelist.issubset(self.tag_sets[i])
+            if accepted and file_filter.tags_blacklist:
+                accepted = not file_filter.tags_blacklist.intersection(self.tag_sets[i])
+            mask.append(accepted)
+        return mask
+
+    def row_of(self, file: VideoFile) -> int:
+        return self._row_by_id.get(file.id, -1)
+
     def rowCount(self, parent=QModelIndex()):
         return len(self.files)
 
@@ -26,20 +64,17 @@ class FileListModel(QAbstractTableModel):
         file_object = self.files[index.row()]
         if role == Qt.ItemDataRole.DisplayRole:
             if index.column() == 0:
-                return file_object.name_prefix
+                return self._display_cache[index.row()][0]
             if index.column() == 1:
-                if file_object.rating:
-                    return '★' * file_object.rating + '☆' * (5 - file_object.rating)
-                else:
-                    return None
+                return _RATING_STRS[file_object.rating or 0]
             elif index.column() == 2:
                 return len(file_object.tags)
             elif index.column() == 3:
-                return humanfriendly.format_size(file_object.size)
+                return self._display_cache[index.row()][1]
             elif index.column() == 4:
-                return file_object.date_modified.strftime('%Y-%m-%d %H:%M:%S')
+                return self._display_cache[index.row()][2]
             elif index.column() == 5:
-                return str(file_object.duration)
+                return self._display_cache[index.row()][3]
         elif role == Qt.ItemDataRole.FontRole:
             if file_object == self._current_playing:
                 font = QFont()
@@ -56,9 +91,22 @@ class FileListModel(QAbstractTableModel):
             return self.horizontal_header_labels[section]
         return None
 
+    def update_durations(self, pairs: List[tuple]):
+        for file_id, duration in pairs:
+            row = self._row_by_id.get(file_id)
+            if row is None:
+                continue
+            self.files[row].duration = duration
+            self.durations[row] = duration
+            cached = self._display_cache[row]
+            self._display_cache[row] = (cached[0], cached[1], cached[2], str(duration))
+            index = self.index(row, 5)
+            self.dataChanged.emit(index, index, [Qt.ItemDataRole.DisplayRole])
+
     def set_files(self, files: List[VideoFile]):
         self.beginResetModel()
         self.files = files
+        self._rebuild_columns()
         self.endResetModel()
 
     @property
@@ -67,5 +115,13 @@ class FileListModel(QAbstractTableModel):
 
     @current_playing.setter
     def current_playing(self, file: VideoFile | None):
+        old_playing = self._current_playing
         self._current_playing = file
-        self.dataChanged.emit(self.index(0, 0), self.index(self.rowCount() - 1, self.columnCount() - 1))
+        last_column = self.columnCount() - 1
+        for changed in (old_playing, file):
+            if changed is None:
+                continue
+            row = self._row_by_id.get(changed.id, -1)
+            if row >= 0:
+                self.dataChanged.emit(self.index(row, 0), self.index(row, last_column),
+                                      [Qt.ItemDataRole.FontRole])
@@ -10,16 +10,44 @@ from VideoFile import VideoFile
 from Ui.FileListModel import FileListModel
 
 
-@dataclass
+@dataclass(slots=True)
 class FileFilter:
     name_regex: str = ''
     name_regex_case_sensitive: bool = False
     path: str = ''
-    rating: Tuple[int, int] = (0, 5)
+    rating_min: int = 0
+    rating_max: int = 5
     tags_whitelist: set[str] = field(default_factory=set)
     tags_blacklist: set[str] = field(default_factory=set)
-    size: Tuple[int, int] = (0, sys.maxsize)
-    date: Tuple[datetime, datetime] = (datetime.min, datetime.max)
+    size_min: int = 0
+    size_max: int = sys.maxsize
+    date_min: datetime = datetime.min
+    date_max: datetime = datetime.max
+    compiled_regex: re.Pattern | None = None
+
+    @property
+    def rating(self) -> Tuple[int, int]:
+        return self.rating_min, self.rating_max
+
+    @rating.setter
+    def rating(self, rating: Tuple[int, int]):
+        self.rating_min, self.rating_max = rating
+
+    @property
+    def size(self) -> Tuple[int, int]:
+        return self.size_min, self.size_max
+
+    @size.setter
+    def size(self, size: Tuple[int, int]):
+        self.size_min, self.size_max = size
+
+    @property
+    def date(self) -> Tuple[datetime, datetime]:
+        return self.date_min, self.date_max
+
+    @date.setter
+    def date(self, date: Tuple[datetime, datetime]):
+        self.date_min, self.date_max = date
 
 
 class FileSortFilterProxyModel(QSortFilterProxyModel):
@@ -30,6 +58,8 @@ class FileSortFilterProxyModel(QSortFilterProxyModel):
         self._current_file: VideoFile | None = None
         self._filter = FileFilter()
         self._re = re.compile('')
+        self._literal_alts: list[str] | None = ['']
+        self._mask: list[bool] | None = None
 
     def sourceModel(self) -> FileListModel:
         if isinstance(super().sourceModel(), FileListModel):
@@ -37,38 +67,68 @@ class FileSortFilterProxyModel(QSortFilterProxyModel):
             return super().sourceModel()
         return FileListModel([])
 
-    def lessThan(self, left, right):
-        if self.sortColumn() != 1:  # Not size column
-            return super().lessThan(left, right)
-
-        left_file = self.sourceModel().files[left.row()]
-        right_file = self.sourceModel().files[right.row()]
+    def setSourceModel(self, model):
+        old = super().sourceModel()
+        if old is not None:
+            old.modelAboutToBeReset.disconnect(self._invalidate_mask)
+            old.dataChanged.disconnect(self._invalidate_mask)
+        if model is not None:
+            # Connected before the proxy's own handlers (made by
+            # setSourceModel below) so the mask is dropped before any
+            # re-filtering reads it.
+            model.modelAboutToBeReset.connect(self._invalidate_mask)
+            model.dataChanged.connect(self._invalidate_mask)
+        super().setSourceModel(model)
+        self._mask = None
+
+    def _invalidate_mask(self, *_args):
+        self._mask = None
 
-        return left_file.size < right_file.size
+    def lessThan(self, left, right):
+        model = self.sourceModel()
+        column = self.sortColumn()
+        left_row, right_row = left.row(), right.row()
+        if column == 0:
+            return model.names_lower[left_row] < model.names_lower[right_row]
+        if column == 1:
+            return model.ratings[left_row] < model.ratings[right_row]
+        if column == 2:
+            return len(model.tag_sets[left_row]) < len(model.tag_sets[right_row])
+        if column == 3:
+            return model.sizes[left_row] < model.sizes[right_row]
+        if column == 4:
+            return model.dates[left_row] < model.dates[right_row]
+        if column == 5:
+            return model.durations[left_row] < model.durations[right_row]
+        return super().lessThan(left, right)
+
+    def _compute_mask(self) -> list[bool]:
+        model = self.sourceModel()
+        mask = model.compute_mask(self._filter)
+        if self._filter.name_regex:
+            if self._literal_alts is not None:
+                if self._filter.name_regex_case_sensitive:
+                    needles = self._literal_alts
+                    mask = [accepted and any(needle in name for needle in needles)
+                            for accepted, name in zip(mask, model.name_prefixes)]
+                else:
+                    needles = [needle.lower() for needle in self._literal_alts]
+                    mask = [accepted and any(needle in name.lower() for needle in needles)
+                            for accepted, name in zip(mask, model.name_prefixes)]
+            else:
+                search = self._re.search
+                mask = [accepted and search(name) is not None
+                        for accepted, name in zip(mask, model.name_prefixes)]
+        return mask
 
     def filterAcceptsRow(self, source_row, source_parent):
         model = self.sourceModel()
-        file_object = model.files[source_row]
+        if self._mask is None:
+            self._mask = self._compute_mask()
 
-        if file_object == self._current_file:
+        if model.files[source_row] == self._current_file:
             return True
-
-        if self._re.search(file_object.name_prefix) is None:
-            return False
-        if self._filter.path and not file_object.path.startswith(self._filter.path):
-            return False
-        rating = file_object.rating or 0
-        if rating < self._filter.rating[0] or rating > self._filter.rating[1]:
-            return False
-        if self._filter.tags_whitelist and not self._filter.tags_whitelist.issubset(file_object.tags):
-            return False
-        if self._filter.tags_blacklist and self._filter.tags_blacklist.intersection(file_object.tags):
-            return False
-        if file_object.size < self._filter.size[0] or file_object.size > self._filter.size[1]:
-            return False
-        if file_object.date_modified < self._filter.date[0] or file_object.date_modified > self._filter.date[1]:
-            return False
-        return True
+        return self._mask[source_row]
 
     @property
     def filter(self):
@@ -77,7 +137,17 @@ class FileSortFilterProxyModel(QSortFilterProxyModel):
     @filter.setter
     def filter(self, f: FileFilter):
         self._filter = f
-        self._re = re.compile(f.name_regex, re.IGNORECASE if not f.name_regex_case_sensitive else re.NOFLAG)
+        if f.compiled_regex is not None:
+            self._re = f.compiled_regex
+        else:
+            try:
+                self._re = re.compile(f.name_regex,
+                                      re.IGNORECASE if not f.name_regex_case_sensitive else re.NOFLAG)
+            except re.error:
+                self._re = re.compile('')
+        parts = f.name_regex.split('|')
+        self._literal_alts = parts if all(re.escape(part) == part for part in parts) else None
+        self._mask = None
         self.invalidateFilter()
         self.filter_changed.emit()
 
@@ -1,8 +1,10 @@
+import re
 from datetime import datetime
+from functools import lru_cache
 from typing import Tuple, Dict, Callable
 
 import humanfriendly
-from PySide6.QtCore import Signal, QTemporaryFile, QPropertyAnimation, QAbstractAnimation, QEasingCurve
+from PySide6.QtCore import Signal, QTemporaryFile, QPropertyAnimation, QEasingCurve, QTimer
 from PySide6.QtGui import QIcon
 from PySide6.QtWidgets import QGroupBox, QVBoxLayout, QHBoxLayout, QLineEdit, QToolButton, QSpinBox, QLabel, \
     QSizePolicy, QDateTimeEdit
@@ -13,6 +15,51 @@ from Ui.TagListWidget import TagListWidget
 from Ui.Tools import to_QDateTime, to_datetime
 
 
+_FIXED_POLICY = QSizePolicy(QSizePolicy.Policy.Fixed, QSizePolicy.Policy.Fixed)
+
+
+@lru_cache(maxsize=512)
+def _format_size(size: int) -> str:
+    return humanfriendly.format_size(size)
+
+
+@lru_cache(maxsize=512)
+def _parse_size(text: str) -> int:
+    return humanfriendly.parse_size(text)
+
+
+class _FilterField:
+    """Descriptor mirroring one FileFilter attribute into its input widget.
+
+    Handles the shared setter pattern in one place: skip if unchanged,
+    store on the filter, write the widget back under the _updating guard
+    and schedule a single batched filter_changed emission.
+    """
+
+    def __init__(self, read, write, update_widget, recompile=False):
+        self.read = read
+        self.write = write
+        self.update_widget = update_widget
+        self.recompile = recompile
+
+    def __get__(self, instance, owner=None):
+        if instance is None:
+            return self
+        return self.read(instance._filter)
+
+    def __set__(self, instance, value):
+        current = self.read(instance._filter)
+        if value is current or value == current:
+            return
+        self.write(instance._filter, value)
+        if self.recompile:
+            instance._recompile_regex()
+        instance._updating = True
+        self.update_widget(instance, value)
+        instance._updating = False
+        instance._schedule_emit()
+
+
 class FilterWidget(QGroupBox):
     filter_changed = Signal(FileFilter)
 
@@ -20,10 +67,24 @@ class FilterWidget(QGroupBox):
         super().__init__(parent)
         self.get_tags_fn = get_tags_fn
         self._filter = FileFilter()
-        self.icon_keep_alive: Dict[QIcon.ThemeIcon, QTemporaryFile | None] = {}
-        self.collapse_animation: QPropertyAnimation | None = None
+        self.collapse_animation = QPropertyAnimation(self, b'maximumHeight')
+        self.collapse_animation.setDuration(200)
+        self.collapse_animation.setEasingCurve(QEasingCurve.Type.InOutCubic)
+        self.collapse_animation.finished.connect(self._on_collapse_finished)
+        self._last_checked: bool | None = None
+        self._emit_pending = False
+        self._updating = False
         self.init_ui(expanded, title)
 
+    def _schedule_emit(self):
+        if not self._emit_pending:
+            self._emit_pending = True
+            QTimer.singleShot(0, self._flush_emit)
+
+    def _flush_emit(self):
+        self._emit_pending = False
+        self.filter_changed.emit(self._filter)
+
     # noinspection PyAttributeOutsideInit
     def init_ui(self, expanded: bool, title: str):
         self.setTitle(title)
@@ -59,13 +120,13 @@ class FilterWidget(QGroupBox):
         self.layout.addLayout(self.rating_layout)
         self.rating_min_edit = QSpinBox()
         self.rating_min_edit.setRange(0, 5)
-        self.rating_min_edit.setValue(self._filter.rating[0])
+        self.rating_min_edit.setValue(self._filter.rating_min)
         self.rating_min_edit.valueChanged.connect(lambda: self.set_min_rating(self.rating_min_edit.value()))
         self.rating_layout.addWidget(self.rating_min_edit)
 
         self.rating_max_edit = QSpinBox()
         self.rating_max_edit.setRange(0, 5)
-        self.rating_max_edit.setValue(self._filter.rating[1])
+        self.rating_max_edit.setValue(self._filter.rating_max)
         self.rating_max_edit.valueChanged.connect(lambda: self.set_max_rating(self.rating_max_edit.value()))
         self.rating_layout.addWidget(self.rating_max_edit)
 
@@ -85,27 +146,27 @@ class FilterWidget(QGroupBox):
         self.layout.addLayout(self.size_layout)
 
         self.size_label = QLabel('Size from')
-        self.size_label.setSizePolicy(QSizePolicy(QSizePolicy.Policy.Fixed, QSizePolicy.Policy.Fixed))
+        self.size_label.setSizePolicy(_FIXED_POLICY)
         self.size_layout.addWidget(self.size_label)
 
         self.size_min_edit = QLineEdit()
-        self.size_min_edit.setText(humanfriendly.format_size(self._filter.size[0]))
+        self.size_min_edit.setText(_format_size(self._filter.size_min))
         self.size_min_edit.setPlaceholderText('Min size')
         self.size_min_edit.setValidator(HumanReadableSizeValidator())
         self.size_min_edit.returnPressed.connect(
-            lambda: self.set_min_size(humanfriendly.parse_size(self.size_min_edit.text())))
+            lambda: self.set_min_size(_parse_size(self.size_min_edit.text())))
         self.size_layout.addWidget(self.size_min_edit)
 
         self.size_to_label = QLabel('to')
-        self.size_to_label.setSizePolicy(QSizePolicy(QSizePolicy.Policy.Fixed, QSizePolicy.Policy.Fixed))
+        self.size_to_label.setSizePolicy(_FIXED_POLICY)
         self.size_layout.addWidget(self.size_to_label)
 
         self.size_max_edit = QLineEdit()
-        self.size_max_edit.setText(humanfriendly.format_size(self._filter.size[1]))
+        self.size_max_edit.setText(_format_size(self._filter.size_max))
         self.size_max_edit.setPlaceholderText('Max size')
         self.size_max_edit.setValidator(HumanReadableSizeValidator())
         self.size_max_edit.returnPressed.connect(
-            lambda: self.set_max_size(humanfriendly.parse_size(self.size_max_edit.text())))
+            lambda: self.set_max_size(_parse_size(self.size_max_edit.text())))
         self.size_layout.addWidget(self.size_max_edit)
 
         self.date_layout = QHBoxLayout()
@@ -113,10 +174,10 @@ class FilterWidget(QGroupBox):
 
         self.date_label = QLabel('Date from')
         self.date_layout.addWidget(self.date_label)
-        self.date_label.setSizePolicy(QSizePolicy(QSizePolicy.Policy.Fixed, QSizePolicy.Policy.Fixed))
+        self.date_label.setSizePolicy(_FIXED_POLICY)
 
         self.date_min_edit = QDateTimeEdit()
-        self.date_min_edit.setDateTime(to_QDateTime(self._filter.date[0]))
+        self.date_min_edit.setDateTime(to_QDateTime(self._filter.date_min))
         self.date_min_edit.setDisplayFormat('yyyy-MM-dd HH:mm:ss')
         self.date_min_edit.setCalendarPopup(True)
         self.date_min_edit.dateTimeChanged.connect(
@@ -125,18 +186,19 @@ class FilterWidget(QGroupBox):
 
         self.date_to_label = QLabel('to')
         self.date_layout.addWidget(self.date_to_label)
-        self.date_to_label.setSizePolicy(QSizePolicy(QSizePolicy.Policy.Fixed, QSizePolicy.Policy.Fixed))
+        self.date_to_label.setSizePolicy(_FIXED_POLICY)
 
         self.date_max_edit = QDateTimeEdit()
-        self.date_max_edit.setDateTime(to_QDateTime(self._filter.date[1]))
+        self.date_max_edit.setDateTime(to_QDateTime(self._filter.date_max))
         self.date_max_edit.setDisplayFormat('yyyy-MM-dd HH:mm:ss')
         self.date_max_edit.setCalendarPopup(True)
         self.date_max_edit.dateTimeChanged.connect(self.set_max_date)
         self.date_layout.addWidget(self.date_max_edit)
 
-        self.setChecked(expanded)
-        self.on_toggle(expanded)
         self.toggled.connect(self.on_toggle)
+        self.setChecked(expanded)
+        if not expanded:
+            self.on_toggle(False)
 
         self.setStyleSheet(f'''
             QGroupBox {{
@@ -162,29 +224,36 @@ class FilterWidget(QGroupBox):
             }}
         ''')
 
-    def get_icon(self, icon: QIcon.ThemeIcon) -> str:
-        temp_file: QTemporaryFile | None = None
-        if icon in self.icon_keep_alive:
-            temp_file = self.icon_keep_alive[icon]
-        else:
+    # Qt style sheets cannot load data: URIs, so each theme icon is rendered
+    # once into a temp file that lives as long as the class.
+    _icon_cache: Dict[QIcon.ThemeIcon, QTemporaryFile | None] = {}
+
+    @classmethod
+    def get_icon(cls, icon: QIcon.ThemeIcon) -> str:
+        if icon not in cls._icon_cache:
+            temp_file = None
             q_icon = QIcon.fromTheme(icon)
             if not q_icon.isNull():
                 temp_file = QTemporaryFile()
-                if not temp_file.open():
-                    temp_file = None
-                else:
+                if temp_file.open():
                     q_icon.pixmap(32).save(temp_file.fileName(), 'PNG')
-            self.icon_keep_alive[icon] = temp_file
-        return temp_file.fileName()
+                else:
+                    temp_file = None
+            cls._icon_cache[icon] = temp_file
+        temp_file = cls._icon_cache[icon]
+        return temp_file.fileName() if temp_file is not None else ''
 
     def on_toggle(self, checked: bool):
-        self.collapse_animation = QPropertyAnimation(self, b'maximumHeight')
-        self.collapse_animation.setDuration(200)
+        if checked == self._last_checked:
+            return
+        self._last_checked = checked
+        self.collapse_animation.stop()
         self.collapse_animation.setStartValue(20 if checked else self.sizeHint().height())
         self.collapse_animation.setEndValue(self.sizeHint().height() if checked else 20)
-        self.collapse_animation.setEasingCurve(QEasingCurve.Type.InOutCubic)
-        self.collapse_animation.start(QAbstractAnimation.DeletionPolicy.DeleteWhenStopped)
-        self.collapse_animation.finished.connect(lambda: self.setFlat(not checked))
+        self.collapse_animation.start()
+
+    def _on_collapse_finished(self):
+        self.setFlat(not self.isChecked())
 
     @property
     def filter(self) -> FileFilter:
@@ -192,58 +261,72 @@ class FilterWidget(QGroupBox):
 
     @filter.setter
     def filter(self, f: FileFilter):
+        self.name_regex_case_sensitive = f.name_regex_case_sensitive
         self.name_regex = f.name_regex
         self.path = f.path
-        self.max_rating = f.rating[0]
-        self.min_rating = f.rating[1]
+        self.min_rating = f.rating_min
+        self.max_rating = f.rating_max
         self.tags_whitelist = f.tags_whitelist
         self.tags_blacklist = f.tags_blacklist
-        self.min_size = f.size[0]
-        self.max_size = f.size[1]
-        self.min_date = f.date[0]
-        self.max_date = f.date[1]
-
-    @property
-    def name_regex(self) -> str:
-        return self._filter.name_regex
-
-    @name_regex.setter
-    def name_regex(self, name_regex: str):
-        if name_regex != self._filter.name_regex:
-            self._filter.name_regex = name_regex
-            self.name_regex_edit.setText(name_regex)
-            self.filter_changed.emit(self._filter)
+        self.min_size = f.size_min
+        self.max_size = f.size_max
+        self.min_date = f.date_min
+        self.max_date = f.date_max
+
+    name_regex = _FilterField(lambda f: f.name_regex,
+                              lambda f, v: setattr(f, 'name_regex', v),
+                              lambda w, v: w.name_regex_edit.setText(v),
+                              recompile=True)
+    name_regex_case_sensitive = _FilterField(lambda f: f.name_regex_case_sensitive,
+                                             lambda f, v: setattr(f, 'name_regex_case_sensitive', v),
+                                             lambda w, v: w.name_regex_case_sensitive_button.setChecked(v),
+                                             recompile=True)
+    path = _FilterField(lambda f: f.path,
+                        lambda f, v: setattr(f, 'path', v),
+                        lambda w, v: w.path_edit.setText(v))
+    min_rating = _FilterField(lambda f: f.rating_min,
+                              lambda f, v: setattr(f, 'rating_min', v),
+                              lambda w, v: w.rating_min_edit.setValue(v))
+    max_rating = _FilterField(lambda f: f.rating_max,
+                              lambda f, v: setattr(f, 'rating_max', v),
+                              lambda w, v: w.rating_max_edit.setValue(v))
+    tags_whitelist = _FilterField(lambda f: f.tags_whitelist,
+                                  lambda f, v: setattr(f, 'tags_whitelist', set(v)),
+                                  lambda w, v: w.tags_whitelist_widget.set_tags(v))
+    tags_blacklist = _FilterField(lambda f: f.tags_blacklist,
+                                  lambda f, v: setattr(f, 'tags_blacklist', set(v)),
+                                  lambda w, v: w.tags_blacklist_widget.set_tags(v))
+    min_size = _FilterField(lambda f: f.size_min,
+                            lambda f, v: setattr(f, 'size_min', v),
+                            lambda w, v: w.size_min_edit.setText(_format_size(v)))
+    max_size = _FilterField(lambda f: f.size_max,
+                            lambda f, v: setattr(f, 'size_max', v),
+                            lambda w, v: w.size_max_edit.setText(_format_size(v)))
+    min_date = _FilterField(lambda f: f.date_min,
+                            lambda f, v: setattr(f, 'date_min', v),
+                            lambda w, v: w.date_min_edit.setDateTime(to_QDateTime(v)))
+    max_date = _FilterField(lambda f: f.date_max,
+                            lambda f, v: setattr(f, 'date_max', v),
+                            lambda w, v: w.date_max_edit.setDateTime(to_QDateTime(v)))
 
     def set_name_regex(self, name_regex: str):
-        self.name_regex = name_regex
+        if not self._updating:
+            self.name_regex = name_regex
 
-    @property
-    def name_regex_case_sensitive(self) -> bool:
-        return self._filter.name_regex_case_sensitive
-
-    @name_regex_case_sensitive.setter
-    def name_regex_case_sensitive(self, name_regex_case_sensitive: bool):
-        if name_regex_case_sensitive != self._filter.name_regex_case_sensitive:
-            self._filter.name_regex_case_sensitive = name_regex_case_sensitive
-            self.name_regex_case_sensitive_button.setChecked(self._filter.name_regex_case_sensitive)
-            self.filter_changed.emit(self._filter)
+    def _recompile_regex(self):
+        flags = re.NOFLAG if self._filter.name_regex_case_sensitive else re.IGNORECASE
+        try:
+            self._filter.compiled_regex = re.compile(self._filter.name_regex, flags)
+        except re.error:
+            self._filter.compiled_regex = None
 
     def set_name_regex_case_sensitive(self, name_regex_case_sensitive: bool):
-        self.name_regex_case_sensitive = name_regex_case_sensitive
-
-    @property
-    def path(self) -> str:
-        return self._filter.path
-
-    @path.setter
-    def path(self, path: str):
-        if path != self._filter.path:
-            self._filter.path = path
-            self.path_edit.setText(path)
-            self.filter_changed.emit(self._filter)
+        if not self._updating:
+            self.name_regex_case_sensitive = name_regex_case_sensitive
 
     def set_path(self, path: str):
-        self.path = path
+        if not self._updating:
+            self.path = path
 
     @property
     def rating(self) -> Tuple[int, int]:
@@ -257,83 +340,51 @@ class FilterWidget(QGroupBox):
     def set_rating(self, rating: Tuple[int, int]):
         self.rating = rating
 
-    @property
-    def min_rating(self) -> int:
-        return self._filter.rating[0]
-
-    @min_rating.setter
-    def min_rating(self, min_rating: int):
-        if min_rating != self._filter.rating[0]:
-            self._filter.rating = (min_rating, self._filter.rating[1])
-            self.rating_min_edit.setValue(min_rating)
-            self.filter_changed.emit(self._filter)
-
     def set_min_rating(self, min_rating: int):
-        self.min_rating = min_rating
-
-    @property
-    def max_rating(self) -> int:
-        return self._filter.rating[1]
-
-    @max_rating.setter
-    def max_rating(self, max_rating: int):
-        if max_rating != self._filter.rating[1]:
-            self._filter.rating = (self._filter.rating[0], max_rating)
-            self.rating_max_edit.setValue(max_rating)
-            self.filter_changed.emit(self._filter)
+        if not self._updating:
+            self.min_rating = min_rating
 
     def set_max_rating(self, max_rating: int):
-        self.max_rating = max_rating
-
-    @property
-    def tags_whitelist(self) -> set[str]:
-        return self._filter.tags_whitelist
-
-    @tags_whitelist.setter
-    def tags_whitelist(self, tags_whitelist: set[str]):
-        if self._filter.tags_whitelist != tags_whitelist:
-            self._filter.tags_whitelist = set(tags_whitelist)
-            self.tags_whitelist_widget.set_tags(tags_whitelist)
-            self.filter_changed.emit(self._filter)
+        if not self._updating:
+            self.max_rating = max_rating
 
     def set_tags_whitelist(self, tags_whitelist: set[str]):
-        self.tags_whitelist = tags_whitelist
+        if not self._updating:
+            self.tags_whitelist = tags_whitelist
 
     def tag_in_whitelist(self, tag: str) -> bool:
         return tag in self.tags_whitelist
 
     def set_tag_in_whitelist(self, tag: str, in_whitelist: bool):
-        if in_whitelist != self.tag_in_whitelist(tag):
-            if in_whitelist:
-                self.tags_whitelist = self.tags_whitelist | {tag}
-                self.set_tag_in_blacklist(tag, False)
-            else:
-                self.tags_whitelist = self.tags_whitelist - {tag}
-
-    @property
-    def tags_blacklist(self) -> set[str]:
-        return self._filter.tags_blacklist
-
-    @tags_blacklist.setter
-    def tags_blacklist(self, tags_blacklist: set[str]):
-        if self._filter.tags_blacklist != tags_blacklist:
-            self._filter.tags_blacklist = set(tags_blacklist)
-            self.tags_blacklist_widget.set_tags(tags_blacklist)
-            self.filter_changed.emit(self._filter)
+        if in_whitelist == self.tag_in_whitelist(tag):
+            return
+        if in_whitelist:
+            self._filter.tags_whitelist.add(tag)
+            self._filter.tags_blacklist.discard(tag)
+            self.tags_blacklist_widget.set_tags(self._filter.tags_blacklist)
+        else:
+            self._filter.tags_whitelist.discard(tag)
+        self.tags_whitelist_widget.set_tags(self._filter.tags_whitelist)
+        self._schedule_emit()
 
     def set_tags_blacklist(self, tags_blacklist: set[str]):
-        self.tags_blacklist = tags_blacklist
+        if not self._updating:
+            self.tags_blacklist = tags_blacklist
 
     def tag_in_blacklist(self, tag: str) -> bool:
         return tag in self.tags_blacklist
 
     def set_tag_in_blacklist(self, tag: str, in_blacklist: bool):
-        if in_blacklist != self.tag_in_blacklist(tag):
-            if in_blacklist:
-                self.tags_blacklist = self.tags_blacklist | {tag}
-                self.set_tag_in_whitelist(tag, False)
-            else:
-                self.tags_blacklist = self.tags_blacklist - {tag}
+        if in_blacklist == self.tag_in_blacklist(tag):
+            return
+        if in_blacklist:
+            self._filter.tags_blacklist.add(tag)
+            self._filter.tags_whitelist.discard(tag)
+            self.tags_whitelist_widget.set_tags(self._filter.tags_whitelist)
+        else:
+            self._filter.tags_blacklist.discard(tag)
+        self.tags_blacklist_widget.set_tags(self._filter.tags_blacklist)
+        self._schedule_emit()
 
     @property
     def size(self) -> Tuple[int, int]:
@@ -347,33 +398,13 @@ class FilterWidget(QGroupBox):
     def set_size(self, size: Tuple[int, int]):
         self.size = size
 
-    @property
-    def min_size(self):
-        return self._filter.size[0]
-
-    @min_size.setter
-    def min_size(self, min_size: int):
-        if min_size != self._filter.size[0]:
-            self._filter.size = (min_size, self._filter.size[1])
-            self.size_min_edit.setText(humanfriendly.format_size(min_size))
-            self.filter_changed.emit(self._filter)
-
     def set_min_size(self, min_size: int):
-        self.min_size = min_size
-
-    @property
-    def max_size(self) -> int:
-        return self._filter.size[1]
-
-    @max_size.setter
-    def max_size(self, max_size: int):
-        if max_size != self._filter.size[1]:
-            self._filter.size = (self._filter.size[0], max_size)
-            self.size_max_edit.setText(humanfriendly.format_size(max_size))
-            self.filter_changed.emit(self._filter)
+        if not self._updating:
+            self.min_size = min_size
 
     def set_max_size(self, max_size: int):
-        self.max_size = max_size
+        if not self._updating:
+            self.max_size = max_size
 
     @property
     def date(self) -> Tuple[datetime, datetime]:
@@ -387,30 +418,10 @@ class FilterWidget(QGroupBox):
     def set_date(self, date: Tuple[datetime, datetime]):
         self.date = date
 
-    @property
-    def min_date(self) -> datetime:
-        return self._filter.date[0]
-
-    @min_date.setter
-    def min_date(self, min_date: datetime):
-        if min_date != self._filter.date[0]:
-            self._filter.date = (min_date, self._filter.date[1])
-            self.date_min_edit.setDateTime(to_QDateTime(min_date))
-            self.filter_changed.emit(self._filter)
-
     def set_min_date(self, min_date: datetime):
-        self.min_date = min_date
-
-    @property
-    def max_date(self) -> datetime:
-        return self._filter.date[1]
-
-    @max_date.setter
-    def max_date(self, max_date: datetime):
-        if max_date != self._filter.date[1]:
-            self._filter.date = (self._filter.date[0], max_date)
-            self.date_max_edit.setDateTime(to_QDateTime(max_date))
-            self.filter_changed.emit(self._filter)
+        if not self._updating:
+            self.min_date = min_date
 
     def set_max_date(self, max_date: datetime):
-        self.max_date = max_date
+        if not self._updating:
+            self.max_date = max_date
@@ -1,20 +1,28 @@
+from functools import lru_cache
+
 import humanfriendly
 from PySide6.QtGui import QValidator
 
 
+@lru_cache(maxsize=512)
+def _parse_size(text: str) -> int | None:
+    try:
+        return humanfriendly.parse_size(text)
+    except humanfriendly.InvalidSize:
+        return None
+
+
 class HumanReadableSizeValidator(QValidator):
     def __init__(self, parent=None):
         super().__init__(parent)
 
     def validate(self, input_str, pos):
-        try:
-            humanfriendly.parse_size(input_str)
+        if not input_str.strip():
+            return QValidator.State.Intermediate, input_str, pos
+        if _parse_size(input_str) is not None:
             return QValidator.State.Acceptable, input_str, pos
-        except humanfriendly.InvalidSize:
-            return QValidator.State.Invalid, input_str, pos
+        return QValidator.State.Invalid, input_str, pos
 
     def fixup(self, input_str):
-        try:
-            return humanfriendly.parse_size(input_str)
-        except humanfriendly.InvalidSize:
-            return ''
+        value = _parse_size(input_str)
+        return value if value is not None else ''
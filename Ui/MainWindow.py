@@ -1,15 +1,16 @@
 import os
+import re
 import sys
 from datetime import datetime
 from pathlib import Path
 
-import jsonpickle
-from PySide6.QtCore import QTimer, Qt, QSortFilterProxyModel, QModelIndex
+from PySide6.QtCore import QTimer, QThread, Qt, QSortFilterProxyModel, QModelIndex
 from PySide6.QtGui import QAction
 from PySide6.QtWidgets import QMainWindow, QWidget, QHBoxLayout, QVBoxLayout, QTableView, QMenu, QPushButton, \
     QLineEdit, QDialog, QHeaderView, QLabel, QSizePolicy, QMessageBox
 
 from Database import Database
+from DurationProber import DurationProber
 from VideoFile import VideoFile
 from Ui.AddFilesDialog import AddFilesDialog
 from Ui.FilterWidget import FilterWidget
@@ -20,6 +21,9 @@ from Ui.FileListModel import FileListModel
 from VlcPlayerConnector import VlcPlayerConnector
 
 
+_TAG_SPLIT = re.compile(r'\s*\|\s*')
+
+
 class MainWindow(QMainWindow):
     def __init__(self):
         super().__init__()
@@ -31,6 +35,10 @@ class MainWindow(QMainWindow):
         self.setGeometry(100, 100, 800, 600)
 
         self.vlc = VlcPlayerConnector()
+        self.vlc_thread = QThread(self)
+        self.vlc.moveToThread(self.vlc_thread)
+        self.vlc_thread.started.connect(self.vlc.create_vlc_instance)
+        self.vlc_thread.start()
 
         self.database = Database('VideoTagger.db')
 
@@ -42,9 +50,18 @@ class MainWindow(QMainWindow):
 
         self.load_files()
 
+        self.duration_prober = DurationProber()
+        self.duration_prober.durations_ready.connect(self.on_durations_ready)
+
+        self._select_debounce = QTimer(self)
+        self._select_debounce.setSingleShot(True)
+        self._select_debounce.setInterval(150)
+        self._select_debounce.timeout.connect(self._commit_selection)
+
         self.timer = QTimer(self)
+        self.timer.setTimerType(Qt.TimerType.CoarseTimer)
+        self.timer.setInterval(2000)
         self.timer.timeout.connect(self.update_vlc_status)
-        self.timer.start(1000)
 
     def _init_ui(self):
         self.central_widget = QWidget()
@@ -68,8 +85,6 @@ class MainWindow(QMainWindow):
         self.file_list.setSortingEnabled(True)
         self.file_list.horizontalHeader().setSectionsClickable(True)
 
-        self.file_list_model = FileListModel([])
-        self.file_list_filter_model = FileSortFilterProxyModel()
         self.file_list_filter_model.setSourceModel(self.file_list_model)
         self.file_list_filter_model.filter_changed.connect(self.update_file_list_status)
         self.file_list.setModel(self.file_list_filter_model)
@@ -87,7 +102,6 @@ class MainWindow(QMainWindow):
         self.file_list.doubleClicked.connect(self.play_current_file)
 
         self.file_list_header = self.file_list.horizontalHeader()
-        self.file_list_header.setContextMenuPolicy(Qt.ContextMenuPolicy.ActionsContextMenu)
         self.file_list_header_context_menu = QMenu(self)
 
         for i, header in list(enumerate(self.file_list_model.horizontal_header_labels))[1:]:
@@ -128,6 +142,16 @@ class MainWindow(QMainWindow):
         self.tag_list.setSortingEnabled(True)
         self.tag_list.horizontalHeader().setSectionsClickable(True)
         self.right_layout.addWidget(self.tag_list)
+
+        self.tag_list_proxy_model = QSortFilterProxyModel()
+        self.tag_list_proxy_model.setSourceModel(self.tag_list_model)
+        self.tag_list.setModel(self.tag_list_proxy_model)
+        self.tag_list.horizontalHeader().setSectionResizeMode(0, QHeaderView.ResizeMode.ResizeToContents)
+        self.tag_list.horizontalHeader().setSectionResizeMode(1, QHeaderView.ResizeMode.Stretch)
+        self.tag_list.horizontalHeader().setSectionResizeMode(2, QHeaderView.ResizeMode.ResizeToContents)
+        self.tag_list.sortByColumn(1, Qt.SortOrder.AscendingOrder)
+        self.tag_list_model.tag_set.connect(self.database.set_tag)
+        self.tag_list_model.tag_removed.connect(self.database.remove_tag)
         self.load_tags()
         self.tag_list.setContextMenuPolicy(Qt.ContextMenuPolicy.CustomContextMenu)
         self.tag_list.customContextMenuRequested.connect(self.show_tag_list_context_menu)
@@ -150,49 +174,39 @@ class MainWindow(QMainWindow):
         dialog = AddFilesDialog(self.database, self)
         dialog.exec()
         if dialog.result() == QDialog.DialogCode.Accepted:
-            for file_path in dialog.found_files:
-                try:
-                    size = os.path.getsize(file_path)
-                    date_modified = datetime.fromtimestamp(os.path.getmtime(file_path))
-                    self.database.add_file(VideoFile(-1, file_path, size, date_modified))
-                except Exception as e:
-                    print(e)
+            files = [VideoFile(-1, path, size, datetime.fromtimestamp(mtime))
+                     for path, (size, mtime) in dialog.found_files.items()]
+            for start in range(0, len(files), 10000):
+                self.database.add_files(files[start:start + 10000])
             self.load_files()
+            self.duration_prober.probe([file for file in self.file_list_model.files if file.duration is None])
 
     def add_tag(self):
-        tag = self.add_tag_edit.text()
+        text = self.add_tag_edit.text().strip()
         self.add_tag_edit.clear()
-        self.tag_list_model.set_tag(tag)
-        if self.selected_file is not None:
-            self.database.set_tag(self.selected_file.id, tag)
-            self.selected_file.tags.add(tag)
-        else:
-            self.database.add_tag(tag)
+        lower_map = self.tag_list_model.tag_lower_map
+        lower_tokens = {token.casefold(): token for token in _TAG_SPLIT.split(text) if token}
+        matched = lower_map.keys() & lower_tokens.keys()
+        tags = {lower_map[key] for key in matched} | {lower_tokens[key] for key in lower_tokens.keys() - matched}
+        for tag in sorted(tags):
+            self.tag_list_model.set_tag(tag)
+            if self.selected_file is not None:
+                self.database.set_tag(self.selected_file.id, tag)
+                self.selected_file.tags.add(tag)
+            else:
+                self.database.add_tag(tag)
 
     def load_files(self):
         files = self.database.get_files()
 
         self.file_list_model.set_files(files)
 
-        if files:
-            common_path = os.path.commonpath([file.path for file in files])
-            min_rating = 5
-            max_rating = 0
-            min_size = sys.maxsize
-            max_size = 0
-            min_date = datetime.max
-            max_date = datetime.min
-            for file in files:
-                min_rating = min(min_rating, file.rating or 0)
-                max_rating = max(max_rating, file.rating or 0)
-                min_size = min(min_size, file.size)
-                max_size = max(max_size, file.size)
-                min_date = min(min_date, file.date_modified)
-                max_date = max(max_date, file.date_modified)
-            self.filter_widget.path = common_path
-            self.filter_widget.rating = (min_rating, max_rating)
-            self.filter_widget.size = (min_size, max_size)
-            self.filter_widget.date = (min_date, max_date)
+        stats = self.database.get_file_stats()
+        if stats:
+            self.filter_widget.path = os.path.commonpath([stats.min_path, stats.max_path])
+            self.filter_widget.rating = (stats.min_rating, stats.max_rating)
+            self.filter_widget.size = (stats.min_size, stats.max_size)
+            self.filter_widget.date = (stats.min_date, stats.max_date)
         else:
             self.filter_widget.path = ''
             self.filter_widget.rating = (0, 5)
@@ -202,19 +216,7 @@ class MainWindow(QMainWindow):
         self.backup_database()
 
     def load_tags(self):
-        tags = self.database.get_tags()
-        self.tag_list_model = TagListModel(tags)
-        proxy_model = QSortFilterProxyModel()
-        proxy_model.setSourceModel(self.tag_list_model)
-        self.tag_list.setModel(proxy_model)
-
-        self.tag_list.horizontalHeader().setSectionResizeMode(0, QHeaderView.ResizeMode.ResizeToContents)
-        self.tag_list.horizontalHeader().setSectionResizeMode(1, QHeaderView.ResizeMode.Stretch)
-        self.tag_list.horizontalHeader().setSectionResizeMode(2, QHeaderView.ResizeMode.ResizeToContents)
-        self.tag_list.sortByColumn(1, Qt.SortOrder.AscendingOrder)
-
-        self.tag_list_model.tag_set.connect(self.database.set_tag)
-        self.tag_list_model.tag_removed.connect(self.database.remove_tag)
+        self.tag_list_model.reset_tags(self.database.get_tags())
 
     def show_tag_list_context_menu(self, pos):
         index = self.tag_list.indexAt(pos)
@@ -258,21 +260,19 @@ class MainWindow(QMainWindow):
 
     def delete_tag(self, tag_name: str):
         self.database.delete_tag(tag_name)
-        index = self.tag_list_model.index(self.tag_list_model.tag_names.index(tag_name), 0)
-        self.tag_list_model.beginRemoveRows(QModelIndex(), index.row(), index.row())
-        self.tag_list_model.tag_names.remove(tag_name)
-        self.tag_list_model.tags.pop(tag_name)
-        self.tag_list_model.endRemoveRows()
+        self.tag_list_model.remove_tag(tag_name)
 
     def on_file_selected(self, selected, _):
         indexes = selected.indexes()
-        if indexes:
-            self.selected_file = indexes[0].data(Qt.ItemDataRole.DisplayRole.UserRole)
+        self.selected_file = indexes[0].data(Qt.ItemDataRole.DisplayRole.UserRole) if indexes else None
+        self._select_debounce.start()
+
+    def _commit_selection(self):
+        if self.selected_file is not None:
             self.file_path_text.setText(self.selected_file.path)
             self.tag_list_model.current_file = self.selected_file
             self.rating_widget.rating = self.selected_file.rating
         else:
-            self.selected_file = None
             self.file_path_text.clear()
             self.tag_list_model.current_file = None
             self.rating_widget.rating = None
@@ -283,8 +283,10 @@ class MainWindow(QMainWindow):
         self.playing_file = self.selected_file
         if self.playing_file:
             self.vlc.play_video(self.playing_file.path)
+            self.timer.start()
         else:
             self.vlc.stop_video()
+            self.timer.stop()
         self.file_list_model.current_playing = self.playing_file
 
     def update_vlc_status(self):
@@ -296,35 +298,41 @@ class MainWindow(QMainWindow):
             self.selected_file.rating = rating
             self.on_current_file_modified()
 
+    def on_durations_ready(self, pairs):
+        self.database.set_durations(pairs)
+        self.file_list_model.update_durations(pairs)
+
     def on_current_file_modified(self):
         index = self.selected_file_index()
         if index and index.isValid():
-            self.file_list_model.dataChanged.emit(self.file_list_model.index(index.row(), 0),
-                                                  self.file_list_model.index(index.row(),
-                                                                             self.file_list_model.columnCount() - 1))
+            rating_index = self.file_list_model.index(index.row(), 1)
+            self.file_list_model.dataChanged.emit(rating_index, rating_index, [Qt.ItemDataRole.DisplayRole])
 
     def show_file_list_context_menu(self, pos):
         self.file_list_header_context_menu.exec(self.file_list.viewport().mapToGlobal(pos))
 
     def toggle_column_visibility(self, column, visible):
         self.file_list.setColumnHidden(column, not visible)
-        for action in self.file_list_header_context_menu.actions():
-            self.database.set_setting(f'column_visibility_{action.text()}', str(action.isChecked()))
+        header = self.file_list_model.horizontal_header_labels[column]
+        self.database.set_setting(f'column_visibility_{header}', str(visible))
 
-    def close_event(self, event):
+    def closeEvent(self, event):
         self.vlc.close()
-        event.accept()
+        self.vlc_thread.quit()
+        self.vlc_thread.wait()
+        super().closeEvent(event)
 
     def selected_file_index(self):
-        if self.file_list_model is None:
+        if self.file_list_model is None or self.selected_file is None:
+            return QModelIndex()
+        row = self.file_list_model.row_of(self.selected_file)
+        if row < 0:
             return QModelIndex()
-        return self.file_list_model.index(self.file_list_model.files.index(self.selected_file), 0)
+        return self.file_list_model.index(row, 0)
 
     def backup_database(self):
-        data = {'Files': self.file_list_model.files, 'Settings': self.database.get_settings()}
-        Path('../backup').mkdir(exist_ok=True)
-        with open(f'backup/{datetime.now().isoformat()}.json', 'w', encoding='utf-8') as f:
-            f.write(jsonpickle.encode(data, unpicklable=False, indent=4))
+        Path('backup').mkdir(exist_ok=True)
+        self.database.backup(f'backup/{datetime.now().isoformat()}.db')
 
     def update_file_list_status(self):
         self.file_list_status_label.setText(f'Showing {self.file_list_filter_model.rowCount()} '
@@ -14,6 +14,13 @@ class StarRatingWidget(QWidget):
         self.hovered_star: int | None = None
         self.stars: List[QLabel] = []
         self.font_size: int = font_size
+        self._styles = {
+            'gray': f'font-size: {font_size}px; color: gray; font-weight: normal',
+            'hover': f'font-size: {font_size}px; color: blue; font-weight: bold',
+            'yellow': f'font-size: {font_size}px; color: yellow; font-weight: normal',
+        }
+        self._star_states: List[tuple | None] = [None] * 5
+        self._last_state: tuple | None = None
         self.init_ui()
 
     def star_mouse_event(self, i: int):
@@ -48,24 +55,25 @@ class StarRatingWidget(QWidget):
             self.rating_changed.emit(rating)
 
     def _update(self):
+        state = (self._rating, self.hovered_star)
+        if state == self._last_state:
+            return
+        self._last_state = state
+        rating = self._rating if self._rating is not None else 0
         for i, star in enumerate(self.stars):
-            rating = self._rating if self._rating is not None else 0
-            if i < rating:
-                star.setText('★')
-            else:
-                star.setText('☆')
-
+            text = '★' if i < rating else '☆'
             if self._rating is None:
-                color = 'gray'
-                weight = 'normal'
+                style = 'gray'
             elif i == self.hovered_star:
-                color = 'blue'
-                weight = 'bold'
+                style = 'hover'
             else:
-                color = 'yellow'
-                weight = 'normal'
-
-            star.setStyleSheet(f'font-size: {self.font_size}px; color: {color}; font-weight: {weight}')
+                style = 'yellow'
+            state = (text, style)
+            if self._star_states[i] == state:
+                continue
+            self._star_states[i] = state
+            star.setText(text)
+            star.setStyleSheet(self._styles[style])
 
     @property
     def rating(self):
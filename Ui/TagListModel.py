@@ -12,11 +12,31 @@ class TagListModel(QAbstractTableModel):
 
     def __init__(self, tags: Dict[str, int]):
         super().__init__()
+        self._current_file: VideoFile | None = None
+        self.reset_tags(tags)
+
+    def reset_tags(self, tags: Dict[str, int]):
+        self.beginResetModel()
         self.tags = tags
         self.tag_names = list(tags.keys())
         self.checked_tags = set()
-        self._current_file: VideoFile | None = None
+        self._current_file = None
         self._max_count = max(tags.values(), default=0)
+        self._tag_lower_map: Dict[str, str] | None = None
+        self._row_by_name: Dict[str, int] | None = None
+        self.endResetModel()
+
+    @property
+    def row_by_name(self) -> Dict[str, int]:
+        if self._row_by_name is None:
+            self._row_by_name = {name: row for row, name in enumerate(self.tag_names)}
+        return self._row_by_name
+
+    @property
+    def tag_lower_map(self) -> Dict[str, str]:
+        if self._tag_lower_map is None:
+            self._tag_lower_map = {name.casefold(): name for name in self.tag_names}
+        return self._tag_lower_map
 
     def rowCount(self, parent=QModelIndex()):
         return len(self.tags)
@@ -49,15 +69,19 @@ class TagListModel(QAbstractTableModel):
             tag_name = self.tag_names[index.row()]
             if value == Qt.CheckState.Checked.value:
                 self.checked_tags.add(tag_name)
+                self.current_file.tags.add(tag_name)
                 self.tags[tag_name] += 1
                 self.tag_set.emit(self.current_file.id, tag_name)
             else:
                 self.checked_tags.remove(tag_name)
+                self.current_file.tags.discard(tag_name)
                 self.tags[tag_name] -= 1
                 self.tag_removed.emit(self.current_file.id, tag_name)
             if self.tags[tag_name] > self._max_count:
                 self._max_count = self.tags[tag_name]
-            self.dataChanged.emit(index, index.sibling(index.row(), self.columnCount() - 1))
+            self.dataChanged.emit(index, index.sibling(index.row(), self.columnCount() - 1),
+                                  [Qt.ItemDataRole.CheckStateRole, Qt.ItemDataRole.DisplayRole,
+                                   Qt.ItemDataRole.ForegroundRole])
             return True
         return False
 
@@ -84,18 +108,47 @@ class TagListModel(QAbstractTableModel):
 
     @current_file.setter
     def current_file(self, file: VideoFile | None):
+        old_checked = self.checked_tags
         if file is not None:
-            self.checked_tags = file.tags
+            self.checked_tags = set(file.tags)
         self._current_file = file
-        self.dataChanged.emit(self.index(0, 0), self.index(self.rowCount() - 1, self.columnCount() - 1))
+        changed_rows = sorted(row for name in old_checked ^ self.checked_tags
+                              if (row := self.row_by_name.get(name)) is not None)
+        last_column = self.columnCount() - 1
+        start = prev = None
+        for row in changed_rows:
+            if start is None:
+                start = prev = row
+            elif row == prev + 1:
+                prev = row
+            else:
+                self.dataChanged.emit(self.index(start, 0), self.index(prev, last_column),
+                                      [Qt.ItemDataRole.CheckStateRole])
+                start = prev = row
+        if start is not None:
+            self.dataChanged.emit(self.index(start, 0), self.index(prev, last_column),
+                                  [Qt.ItemDataRole.CheckStateRole])
+
+    def remove_tag(self, tag_name: str):
+        row = self.row_by_name[tag_name]
+        self.beginRemoveRows(QModelIndex(), row, row)
+        del self.tag_names[row]
+        self.tags.pop(tag_name)
+        self._tag_lower_map = None
+        self._row_by_name = None
+        self.endRemoveRows()
 
     def set_tag(self, tag_name: str):
         if tag_name not in self.tags:
             self.beginInsertRows(QModelIndex(), self.rowCount(), self.rowCount())
             self.tags[tag_name] = 0
             self.tag_names.append(tag_name)
+            self._tag_lower_map = None
+            self._row_by_name = None
             self.endInsertRows()
         if self.current_file and tag_name not in self.current_file.tags:
             self.tags[tag_name] += 1
             self.current_file.tags.add(tag_name)
-            self.dataChanged.emit(self.index(0, 0), self.index(self.rowCount() - 1, self.columnCount() - 1))
+            self.checked_tags.add(tag_name)
+            row = self.row_by_name[tag_name]
+            self.dataChanged.emit(self.index(row, 0), self.index(row, self.columnCount() - 1))
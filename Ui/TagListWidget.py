@@ -1,3 +1,4 @@
+from bisect import bisect_left
 from typing import List, Set, Callable
 
 from PySide6.QtCore import Qt, Signal
@@ -41,6 +42,7 @@ class TagListWidget(QWidget):
         super().__init__()
         self.tags: Set[str] = set()
         self.widgets: List[TagWidget] = []
+        self._sorted_names: List[str] = []
         self.get_tags_fn = get_tags_fn
         self.setObjectName('container')
         background_color = self.palette().color(QPalette.ColorRole.Base)
@@ -90,50 +92,46 @@ class TagListWidget(QWidget):
                 action.triggered.connect(lambda _, t=tag: self.add_tag(t))
         menu.exec(event.globalPosition().toPoint())
 
-    def _add_tag_widget(self, tag: str, index: int):
+    def _insert_tag(self, tag: str):
+        self.tags.add(tag)
+        index = bisect_left(self._sorted_names, tag)
+        self._sorted_names.insert(index, tag)
         widget = TagWidget(tag)
         widget._remove_clicked.connect(self.remove_tag)
         self.widgets.insert(index, widget)
         self.layout.insertWidget(index, widget)
 
-    def _remove_tag_widget(self, tag: str):
-        for widget in self.widgets:
-            if widget.tag_name == tag:
-                self.layout.removeWidget(widget)
-                self.widgets.remove(widget)
-                widget.deleteLater()
-                self.list_changed.emit(self.tags)
-                return
+    def _discard_tag(self, tag: str):
+        self.tags.remove(tag)
+        index = bisect_left(self._sorted_names, tag)
+        del self._sorted_names[index]
+        widget = self.widgets.pop(index)
+        self.layout.removeWidget(widget)
+        widget.deleteLater()
 
     def add_tag(self, tag: str):
         if tag in self.tags:
             return
-        self.tags.add(tag)
-        found = False
-        index = 0
-        for index, widget in enumerate(self.widgets):
-            if widget.tag_name > tag:
-                found = True
-                break
-        if not found:
-            index = len(self.widgets)
-        self._add_tag_widget(tag, index)
+        self._insert_tag(tag)
         self.list_changed.emit(self.tags)
 
     def remove_tag(self, tag: str):
         if tag not in self.tags:
             return
-        self.tags.remove(tag)
-        self._remove_tag_widget(tag)
+        self._discard_tag(tag)
         self.list_changed.emit(self.tags)
 
     def set_tags(self, tags: Set[str]):
         if tags == self.tags:
             return
-        for tag in self.tags - tags:
-            self.remove_tag(tag)
-        for tag in tags - self.tags:
-            self.add_tag(tag)
+        self.setUpdatesEnabled(False)
+        try:
+            for tag in self.tags - tags:
+                self._discard_tag(tag)
+            for tag in tags - self.tags:
+                self._insert_tag(tag)
+        finally:
+            self.setUpdatesEnabled(True)
         self.list_changed.emit(self.tags)
 
     def paintEvent(self, _):
@@ -12,15 +12,10 @@ class VideoFile:
     duration: float | None = None
     rating: int | None = None
     tags: set[str] = field(default_factory=set)
+    name: str = field(init=False, repr=False, compare=False)
+    name_prefix: str = field(init=False, repr=False, compare=False)
+    extension: str = field(init=False, repr=False, compare=False)
 
-    @property
-    def name(self):
-        return os.path.basename(self.path)
-
-    @property
-    def name_prefix(self):
-        return os.path.splitext(self.name)[0]
-
-    @property
-    def extension(self):
-        return os.path.splitext(self.path)[1]
+    def __post_init__(self):
+        self.name = os.path.basename(self.path)
+        self.name_prefix, self.extension = os.path.splitext(self.name)
@@ -1,14 +1,27 @@
-from PySide6.QtCore import QObject, QProcess
+from PySide6.QtCore import QObject, QProcess, Signal, Slot
 
 
 class VlcPlayerConnector(QObject):
+    """Drives a VLC process over its rc interface.
+
+    The public methods only emit queued signals, so they are safe to call
+    from the GUI thread while the blocking pipe round-trips run on
+    whichever thread the connector has been moved to.
+    """
+
+    _command = Signal(str)
+    _quit_requested = Signal()
+
     def __init__(self):
         super().__init__()
-        self.create_vlc_instance()
+        self.vlc_process: QProcess | None = None
+        self._command.connect(self._send)
+        self._quit_requested.connect(self._close)
 
     # noinspection PyAttributeOutsideInit
+    @Slot()
     def create_vlc_instance(self):
-        self.vlc_process = QProcess()
+        self.vlc_process = QProcess(self)
         self.vlc_process.setProgram("vlc")
         self.vlc_process.setArguments(["--extraintf", "rc"])
         self.vlc_process.start()
@@ -23,29 +36,38 @@ class VlcPlayerConnector(QObject):
             if data.endswith(b'> ') or self.vlc_process.state() == QProcess.ProcessState.NotRunning:
                 return data[:-2].strip()
 
-    def send(self, command):
+    @Slot(str)
+    def _send(self, command):
+        if self.vlc_process is None:
+            return b''
         self.vlc_process.write(f'{command}\n'.encode())
         self.vlc_process.waitForBytesWritten()
         return self._read_stdout()
 
+    @Slot()
+    def _close(self):
+        if self.vlc_process is None:
+            return
+        self._send('quit')
+        self.vlc_process.waitForFinished()
+
     def play_video(self, video_path):
-        self.send('clear')
-        self.send(f'add {video_path}')
-        self.send(f'play')
+        self._command.emit('clear')
+        self._command.emit(f'add {video_path}')
+        self._command.emit('play')
 
     def pause_video(self):
-        self.send('pause')
+        self._command.emit('pause')
 
     def stop_video(self):
-        self.send('stop')
+        self._command.emit('stop')
 
     def update_status(self):
-        self.send('status')
-        self.send('get_time')
+        self._command.emit('status')
+        self._command.emit('get_time')
 
     def seek_video(self, time):
-        self.send(f'seek {time}')
+        self._command.emit(f'seek {time}')
 
     def close(self):
-        self.send('quit')
-        self.vlc_process.waitForFinished()
+        self._quit_requested.emit()